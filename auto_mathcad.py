@@ -3,9 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Union, Optional
 import logging, shutil
-import comtypes.client as cc
-from comtypes import COMError
-from openpyxl import load_workbook
+# comtypes y openpyxl se importan al usarse: importar este módulo no exige COM
 
 logging.basicConfig(format="%(levelname)s: %(message)s", level=logging.INFO)
 
@@ -14,6 +12,8 @@ _PROGIDS = ["MathcadPrime.Application",
 EXCEL_NAME = "Entrada_Datos_01.xlsx"                      # nombre fijo
 # ---------------------------------------------------------------------- #
 def _prime_object():
+    import comtypes.client as cc
+    from comtypes import COMError
     errs = []
     for pid in _PROGIDS:
         try:
@@ -35,6 +35,7 @@ def _ws_active(app):
     return ws
 # ---------------------------------------------------------------------- #
 def _leer_variables_excel(xlsx: Path) -> dict[str, float]:
+    from openpyxl import load_workbook
     wb = load_workbook(xlsx, data_only=True)
     ws = wb["Parts Value"]
     out: dict[str, float] = {}
@@ -57,6 +58,7 @@ def rellenar_plantilla_wca(
     xlsx: Union[str, Path],
     plantilla: Optional[str | Path] = None
 ) -> None:
+    from comtypes import COMError
     xlsx = Path(xlsx).resolve()
     if not xlsx.exists():
         raise FileNotFoundError(xlsx)
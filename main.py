@@ -1,15 +1,18 @@
 # ───────── GUI Traductor + Plantilla WCA (Prime 10) ─────────
 from __future__ import annotations
 from pathlib import Path
-import os, subprocess, sys, tkinter as tk
-from tkinter import filedialog, simpledialog, messagebox
+import argparse, json, os, subprocess, sys
 
-import traductor                         # ← contiene WARNINGS
-from auto_mathcad import rellenar_plantilla_wca
+# tkinter, traductor (openpyxl) y auto_mathcad (comtypes) se importan
+# solo en la ruta que los necesita: el modo --no-gui no requiere display.
+
+# widgets globales, creados en _lanzar_gui()
+ventana = ruta_archivo = text_area = None
 
 
 # ──────────── GUI callbacks ─────────────────────────────────
 def seleccionar_archivo() -> None:
+    from tkinter import filedialog
     ruta = filedialog.askopenfilename(
         title="Selecciona un archivo de datos",
         filetypes=[
@@ -24,22 +27,20 @@ def seleccionar_archivo() -> None:
 
 
 def _mostrar_contenido(ruta: str) -> None:
+    import tkinter as tk
+    from tkinter import messagebox
+    from traductor import leer_lineas        # misma detección que los parsers
     text_area.delete("1.0", tk.END)
-    for enc in ("utf-8", "latin-1"):
-        try:
-            text_area.insert(tk.END, Path(ruta).read_text(encoding=enc))
-            break
-        except UnicodeDecodeError:
-            continue
-    else:
-        messagebox.showerror(
-            "Error de lectura",
-            "No se pudo leer el archivo con codificación UTF-8 ni Latin-1."
-        )
+    try:
+        text_area.insert(tk.END, "\n".join(leer_lineas(ruta)))   # un solo insert
+    except OSError as e:
+        messagebox.showerror("Error de lectura",
+                             f"No se pudo leer el archivo:\n{e}")
 
 
 def _abrir_excel(path: Path) -> None:
     """Lanza el .xlsx con la app asociada al sistema (Windows / macOS / Linux)."""
+    from tkinter import messagebox
     try:
         if sys.platform.startswith("win"):
             os.startfile(path)                       # type: ignore[attr-defined]
@@ -54,6 +55,10 @@ def _abrir_excel(path: Path) -> None:
 
 
 def procesar_archivo() -> None:
+    from tkinter import filedialog, simpledialog, messagebox
+    import traductor                         # ← contiene WARNINGS
+    from auto_mathcad import rellenar_plantilla_wca
+
     archivo = ruta_archivo.get()
     if not archivo:
         messagebox.showwarning("Advertencia", "Selecciona un archivo primero.")
@@ -70,13 +75,7 @@ def procesar_archivo() -> None:
 
     # 2) Traductor  ─ genera Entrada_Datos_01.xlsx y llena traductor.WARNINGS
     try:
-        ext = Path(archivo).suffix.lower()
-        if ext == ".net":
-            info_trad = traductor.procesar_net(archivo, h_s)
-        elif ext == ".bom":
-            info_trad = traductor.procesar_bom(archivo, h_s)
-        else:
-            info_trad = traductor.procesar_generico(archivo, h_s)
+        info_trad = traductor.procesar(archivo, h_s)
     except Exception as err:
         messagebox.showerror("Traductor", f"Error durante la conversión:\n{err}")
         return
@@ -142,30 +141,107 @@ def procesar_archivo() -> None:
 
 
 # ──────────── Construcción GUI ─────────────────────────────
-ventana = tk.Tk()
-ventana.title("Traductor → Plantilla WCA (Mathcad Prime 10)")
-ventana.geometry("850x520")
+def _lanzar_gui(inicial: str | None = None) -> None:
+    global ventana, ruta_archivo, text_area
+    import tkinter as tk
+
+    ventana = tk.Tk()
+    ventana.title("Traductor → Plantilla WCA (Mathcad Prime 10)")
+    ventana.geometry("850x520")
+
+    ruta_archivo = tk.StringVar(value="")
 
-ruta_archivo = tk.StringVar(value="")
+    frame_top = tk.Frame(ventana)
+    frame_top.pack(pady=10, fill="x")
 
-frame_top = tk.Frame(ventana)
-frame_top.pack(pady=10, fill="x")
+    tk.Button(
+        frame_top, text="Seleccionar archivo (.net / .bom / .csv)",
+        command=seleccionar_archivo
+    ).pack(side="left", padx=6)
 
-tk.Button(
-    frame_top, text="Seleccionar archivo (.net / .bom / .csv)",
-    command=seleccionar_archivo
-).pack(side="left", padx=6)
+    tk.Entry(
+        frame_top, textvariable=ruta_archivo, width=95, state="readonly"
+    ).pack(side="left", fill="x", expand=True)
 
-tk.Entry(
-    frame_top, textvariable=ruta_archivo, width=95, state="readonly"
-).pack(side="left", fill="x", expand=True)
+    text_area = tk.Text(ventana, height=20, width=110, wrap="none")
+    text_area.pack(padx=10, pady=10, fill="both", expand=True)
 
-text_area = tk.Text(ventana, height=20, width=110, wrap="none")
-text_area.pack(padx=10, pady=10, fill="both", expand=True)
+    tk.Button(
+        ventana, text="Procesar y rellenar plantilla WCA",
+        command=procesar_archivo
+    ).pack(pady=12)
 
-tk.Button(
-    ventana, text="Procesar y rellenar plantilla WCA",
-    command=procesar_archivo
-).pack(pady=12)
+    if inicial:
+        ruta_archivo.set(inicial)
+        _mostrar_contenido(inicial)
 
-ventana.mainloop()
+    ventana.mainloop()
+
+
+# ──────────── Modo sin GUI (CLI) ───────────────────────────
+def _ejecutar_cli(args: argparse.Namespace) -> int:
+    import traductor
+
+    entrada = Path(args.input)
+    if not entrada.exists():
+        print(f"Error: archivo no encontrado: {entrada}", file=sys.stderr)
+        return 2
+
+    try:
+        res = traductor.traducir(entrada, args.hs, args.output or traductor.DEST_XLSX)
+    except Exception as err:
+        print(f"Error durante la conversión: {err}", file=sys.stderr)
+        return 1
+
+    codigo = 0
+    if args.mathcad or args.plantilla:
+        from auto_mathcad import rellenar_plantilla_wca
+        try:
+            rellenar_plantilla_wca(res["xlsx"], args.plantilla)
+            res["mathcad"] = "ok"
+        except Exception as err:
+            res["mathcad"] = f"error: {err}"
+            codigo = 1
+
+    if args.json:
+        print(json.dumps(res, ensure_ascii=False, indent=2))
+        return codigo
+
+    print(f"✔ {res['componentes']} comp ({entrada.name}) → {res['xlsx']}")
+    if res["advertencias"]:
+        print(f"⚠ {len(res['advertencias'])} advertencia(s)\n  – "
+              + "\n  – ".join(res["advertencias"]))
+    if "mathcad" in res:
+        print("Plantilla WCA actualizada correctamente." if codigo == 0
+              else f"Mathcad no pudo completarse: {res['mathcad']}")
+    return codigo
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(
+        description="Traduce netlists / BoM a Entrada_Datos_01.xlsx y, "
+                    "opcionalmente, rellena la plantilla WCA de Mathcad Prime")
+    ap.add_argument("-i", "--input", help="Archivo .net / .asc / .sxsch / .bom / .csv")
+    ap.add_argument("--hs", default="", help="Función de transferencia H(s) (opcional)")
+    ap.add_argument("-o", "--output", help="Excel de salida (por defecto Entrada_Datos_01.xlsx)")
+    ap.add_argument("--no-gui", action="store_true", help="Ejecuta sin interfaz gráfica")
+    ap.add_argument("--mathcad", action="store_true",
+                    help="Envía el Excel a la plantilla activa de Mathcad Prime")
+    ap.add_argument("-p", "--plantilla", help="Plantilla .mcdx a abrir (implica --mathcad)")
+    ap.add_argument("--json", action="store_true", help="Imprime el resumen en JSON")
+    args = ap.parse_args(argv)
+
+    if not args.no_gui:
+        solo_cli = [o for o, v in (("--output", args.output), ("--mathcad", args.mathcad),
+                                   ("--plantilla", args.plantilla), ("--json", args.json)) if v]
+        if solo_cli:
+            ap.error(f"{', '.join(solo_cli)} requiere(n) --no-gui")
+        _lanzar_gui(args.input)
+        return 0
+    if not args.input:
+        ap.error("--input es obligatorio con --no-gui")
+    return _ejecutar_cli(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+# ─────────── test_main.py ─ pytest ───────────
+from __future__ import annotations
+from pathlib import Path
+import json, subprocess, sys
+
+import pytest
+
+import main
+
+NET = ("* test\n"
+       "R1 n1 n2 {mc(4k7,TOLR1)}\n"
+       "C1 n2 0 100n\n"
+       ".param TOLR1=0.01\n")
+
+
+# ────────── CLI --no-gui ────────────────────────────────────────────────
+def test_cli_ok_json(tmp_path, capsys):
+    net = tmp_path / "a.net"
+    net.write_text(NET)
+    dst = tmp_path / "out.xlsx"
+    assert main.main(["-i", str(net), "--no-gui", "--json", "-o", str(dst)]) == 0
+    res = json.loads(capsys.readouterr().out)
+    assert res["tipo"] == "net"
+    assert res["componentes"] == 3
+    assert res["xlsx"] == str(dst.resolve())
+    assert res["advertencias"] == []
+    assert "mathcad" not in res
+    assert dst.exists()
+
+
+def test_cli_archivo_inexistente(tmp_path):
+    assert main.main(["-i", str(tmp_path / "no.net"), "--no-gui"]) == 2
+
+
+def test_cli_sin_input():
+    with pytest.raises(SystemExit) as e:
+        main.main(["--no-gui"])
+    assert e.value.code == 2
+
+
+@pytest.mark.parametrize("flags", [["--json"], ["-o", "x.xlsx"], ["--mathcad"],
+                                   ["-p", "t.mcdx"]])
+def test_opciones_cli_sin_no_gui(flags):
+    with pytest.raises(SystemExit) as e:
+        main.main(["-i", "a.net", *flags])
+    assert e.value.code == 2
+
+
+def test_no_gui_no_importa_tkinter_ni_comtypes(tmp_path):
+    net = tmp_path / "a.net"
+    net.write_text(NET)
+    codigo = (
+        "import sys, main\n"
+        f"rc = main.main(['-i', {str(net)!r}, '-o', {str(tmp_path / 'o.xlsx')!r}, '--no-gui'])\n"
+        "print(rc, sorted({'tkinter', '_tkinter', 'comtypes'} & set(sys.modules)))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", codigo], cwd=Path(__file__).parent,
+                         capture_output=True, text=True, check=True).stdout
+    assert out.splitlines()[-1] == "0 []"
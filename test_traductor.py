@@ -0,0 +1,145 @@
+# ─────────── test_traductor.py ─ pytest ───────────
+from __future__ import annotations
+
+import pytest
+
+import traductor
+
+NET = ("* test\n"
+       "R1 n1 n2 {mc(4k7,TOLR1)}\n"
+       "C1 n2 0 100n\n"
+       ".param TOLR1=0.01\n")
+
+
+# ────────── despacho por extensión ──────────────────────────────────────
+@pytest.mark.parametrize("ext, tipo", [
+    (".net", "net"), (".asc", "net"), (".sxsch", "net"),
+    (".bom", "bom"), (".csv", "csv"),
+])
+def test_traducir_despacho(tmp_path, ext, tipo):
+    f = tmp_path / f"a{ext}"
+    f.write_text("Ref,Value\nR1,4700\n" if tipo != "net" else NET)
+    res = traductor.traducir(f, dst=tmp_path / "out.xlsx")
+    assert res["tipo"] == tipo
+
+
+def test_procesar_sin_tipo_usa_la_extension(tmp_path):
+    f = tmp_path / "a.asc"
+    f.write_text(NET)
+    assert traductor.procesar(f, dst=tmp_path / "o.xlsx").startswith("✔ 3 comp")
+
+
+def test_procesar_bom_fuerza_parser(tmp_path):
+    f = tmp_path / "b.csv"
+    f.write_text("Reference,Value\nR1,4700\n")
+    assert traductor.procesar_bom(f, dst=tmp_path / "o.xlsx") == "✔ 1 filas BoM (b.csv)"
+
+
+def test_procesar_net_fuerza_parser(tmp_path):
+    f = tmp_path / "n.cir"
+    f.write_text("R1 a b 1k\n")
+    assert traductor.procesar_net(f, dst=tmp_path / "o.xlsx") == "✔ 1 comp (n.cir)"
+
+
+# ────────── detección de codificación ───────────────────────────────────
+MU = NET + "* 5µ\n"
+
+@pytest.mark.parametrize("datos, enc, texto", [
+    (b"\xef\xbb\xbf" + NET.encode(),            "utf-8-sig", NET),
+    (b"\xff\xfe" + NET.encode("utf-16-le"),     "utf-16",    NET),
+    (b"\xfe\xff" + NET.encode("utf-16-be"),     "utf-16",    NET),
+    (b"\xff\xfe\0\0" + NET.encode("utf-32-le"), "utf-32",    NET),
+    (b"\0\0\xfe\xff" + NET.encode("utf-32-be"), "utf-32",    NET),
+    (NET.encode("utf-16-le"),                   "utf-16-le", NET),
+    (NET.encode("utf-16-be"),                   "utf-16-be", NET),
+    (NET.encode("utf-32-le"),                   "utf-32-le", NET),
+    (NET.encode("utf-32-be"),                   "utf-32-be", NET),
+    (MU.encode(),                               "utf-8",     MU),
+    (MU.encode("latin-1"),                      "latin-1",   MU),
+])
+def test_detectar_encoding(tmp_path, datos, enc, texto):
+    assert traductor.detectar_encoding(datos) == enc
+    f = tmp_path / "a.net"
+    f.write_bytes(datos)
+    assert list(traductor.leer_lineas(f)) == texto.splitlines()
+
+
+def test_ltspice_utf16le(tmp_path):
+    f = tmp_path / "a.net"
+    f.write_bytes(b"\xff\xfe" + NET.replace("\n", "\r\n").encode("utf-16-le"))
+    vals, pkgs, tols = traductor.parse_ltspice(f)
+    assert set(vals) == {"TOLR1", "R1", "C1"}
+    assert tols["R1"][0] == 0.01
+    assert vals["C1"] == pytest.approx(100e-9)
+
+
+def test_latin1_tras_prefijo_no_se_corrompe(tmp_path):
+    # el primer byte no ASCII está más allá de los 4 KiB inspeccionados
+    txt = "".join(f"* comentario {i:03d} " + "x" * 40 + "\n" for i in range(120))
+    txt += "C1 N002 0 10µ\nL1 N002 0 4.7µ\n"
+    f = tmp_path / "a.net"
+    f.write_bytes(txt.encode("latin-1"))
+    assert len(txt) > traductor._PREFIJO
+    assert traductor.detectar_encoding(txt.encode("latin-1")[:traductor._PREFIJO]) == "utf-8"
+
+    lineas = list(traductor.leer_lineas(f))
+    assert lineas == txt.splitlines()
+    traductor.WARNINGS.clear()
+    vals, _, _ = traductor.parse_ltspice(f)
+    assert vals["C1"] != 10.0 and vals["L1"] != 4.7      # nunca 10 F en silencio
+    assert any("10µ" in w for w in traductor.WARNINGS)
+
+
+def test_sustitucion_avisada(tmp_path):
+    f = tmp_path / "a.net"
+    f.write_bytes(b"\xff\xfe" + "R1 a b 1k\n".encode("utf-16-le") + b"\x00\xd8")
+    traductor.WARNINGS.clear()
+    list(traductor.leer_lineas(f))
+    assert any("sustituidos" in w for w in traductor.WARNINGS)
+
+
+def test_bom_csv_por_streaming(tmp_path):
+    # cabecera y filas repartidas a ambos lados del bloque de muestra (20 líneas)
+    filas = "".join(f"R{i},{i}k,1,P0805\n" for i in range(1, 40))
+    f = tmp_path / "a.bom"
+    f.write_bytes(("titulo\n\nReference,Value,Tolerance,Package\n" + filas)
+                  .encode("utf-16"))
+    vals, pkgs, tols = traductor.parse_bom(f)
+    assert len(vals) == 39
+    assert vals["R39"] == 39e3 and tols["R39"][0] == 0.01
+
+
+@pytest.mark.parametrize("enc, cabecera", [
+    ("utf-16-le", "* ─ comentario\n"),
+    ("utf-16-be", "* Ā comentario\n"),
+    ("utf-32-le", "* ∀ comentario\n"),
+    ("utf-32-be", "* 　 comentario\n"),
+])
+def test_sin_bom_con_byte_bajo_nulo(tmp_path, enc, cabecera):
+    # un solo carácter con byte bajo 0x00 no debe romper la detección
+    datos = (cabecera + NET).encode(enc)
+    assert traductor.detectar_encoding(datos) == enc
+    f = tmp_path / "a.net"
+    f.write_bytes(datos)
+    vals, _, _ = traductor.parse_ltspice(f)
+    assert set(vals) == {"TOLR1", "R1", "C1"}
+
+
+def test_utf8_con_byte_ansi_no_mezcla_codificaciones(tmp_path):
+    # el byte suelto cae en un bloque de TextIOWrapper lleno de UTF-8 válido
+    lineas = [f"* ñ comentario {i:03d}" for i in range(300)] + ["C1 a 0 10\xb5"]
+    f = tmp_path / "a.net"
+    f.write_bytes("\n".join(lineas[:-1]).encode() + b"\nC1 a 0 10\xb5\n")
+    assert list(traductor.leer_lineas(f)) == lineas
+
+
+def test_sustituciones_por_flujo(tmp_path):
+    malo, bueno = tmp_path / "malo.net", tmp_path / "bueno.net"
+    malo.write_bytes(b"\xff\xfe" + "R1 a b 1k\n".encode("utf-16-le") + b"\x00\xd8")
+    bueno.write_bytes(b"\xff\xfe" + ("* x\n" * 2000).encode("utf-16-le"))
+    traductor.WARNINGS.clear()
+    g1, g2 = traductor.leer_lineas(bueno), traductor.leer_lineas(malo)
+    next(g1)
+    list(g2)                             # se consume entre dos lecturas de g1
+    list(g1)
+    assert len(traductor.WARNINGS) == 1 and "malo.net" in traductor.WARNINGS[0]
@@ -1,9 +1,10 @@
 # ─────────── traductor.py  (rev-24-may-2025) ───────────
 from __future__ import annotations
 from pathlib import Path
-import csv, re, sys
+import codecs, csv, io, re, sys
 from collections import defaultdict
-from openpyxl import Workbook, load_workbook
+from itertools import chain, islice
+# openpyxl se importa solo al escribir el Excel (arranque rápido del CLI)
 
 # ───────────────────────── configuración ────────────────────────────────
 DEST_XLSX = "Entrada_Datos_01.xlsx"
@@ -74,8 +75,89 @@ def _sheet(wb, name, header, rows):
         ws.append(list(r))
 
 def _wb(path: Path):
+    from openpyxl import Workbook, load_workbook
     return load_workbook(path) if path.exists() else Workbook()
 
+# ════════════════════════════════════════════════════════════════════════
+#  ENTRADA – detección de codificación + lectura por líneas
+# ════════════════════════════════════════════════════════════════════════
+_PREFIJO = 4096                   # bytes inspeccionados para decidir
+
+_BOMS = [                         # UTF-32 antes que UTF-16 (mismo inicio FF FE)
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8,     "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+_NULOS_ALTO, _NULOS_BAJO = 0.7, 0.1   # fracción de bytes nulos por columna
+
+def _frac_nulos(prefijo: bytes, paso: int) -> list[float]:
+    cols = [prefijo[i::paso] for i in range(paso)]
+    return [c.count(0) / len(c) for c in cols]
+
+def detectar_encoding(prefijo: bytes) -> str:
+    """
+    Decide la codificación a partir de los primeros bytes del archivo:
+    BOM → UTF-32 / UTF-16 sin BOM (proporción de bytes nulos) → UTF-8 →
+    Latin-1. El UTF-8 es solo una hipótesis: leer_lineas() decodifica
+    cada byte inválido posterior como Latin-1.
+    """
+    for bom, enc in _BOMS:
+        if prefijo.startswith(bom):
+            return enc
+    if len(prefijo) >= 8:
+        # texto casi-ASCII en UTF-32: 3 de cada 4 bytes son nulos
+        f = _frac_nulos(prefijo, 4)
+        if f[0] < _NULOS_BAJO and min(f[1:]) > _NULOS_ALTO:
+            return "utf-32-le"
+        if f[3] < _NULOS_BAJO and min(f[:3]) > _NULOS_ALTO:
+            return "utf-32-be"
+    if len(prefijo) >= 4:
+        # un carácter como «─» (U+2500) aporta un nulo a la otra columna
+        pares, impares = _frac_nulos(prefijo, 2)
+        if impares > _NULOS_ALTO and pares < _NULOS_BAJO:
+            return "utf-16-le"            # LTspice XVII sin BOM
+        if pares > _NULOS_ALTO and impares < _NULOS_BAJO:
+            return "utf-16-be"
+    try:
+        # final=False: un carácter multibyte cortado al final no es error
+        codecs.getincrementaldecoder("utf-8")().decode(prefijo, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+# UTF-8 con bytes sueltos ANSI (p. ej. «µ» = 0xB5 pasados los 4 KiB):
+# cada byte inválido se interpreta como Latin-1, en la misma pasada.
+codecs.register_error("traductor-latin1",
+                      lambda e: (e.object[e.start:e.end].decode("latin-1"), e.end))
+
+def leer_lineas(path):
+    """
+    Generador de líneas (sin salto final) decodificadas de forma incremental.
+    El prefijo se inspecciona con peek(), así que el archivo se lee una
+    sola vez y nunca se carga entero en memoria.
+
+    En UTF-8 los bytes inválidos se toman como Latin-1; en UTF-16/32 se
+    sustituyen por «\ufffd» y se avisa en WARNINGS.
+    """
+    sustituidos = 0
+    with open(path, "rb", buffering=_PREFIJO) as raw:
+        enc = detectar_encoding(raw.peek(_PREFIJO)[:_PREFIJO])
+        if enc.startswith("utf-8"):
+            errores = "traductor-latin1"
+        else:
+            errores = "strict" if enc == "latin-1" else "replace"
+        with io.TextIOWrapper(raw, encoding=enc, errors=errores) as f:
+            for ln in f:
+                if errores == "replace":
+                    sustituidos += ln.count("\ufffd")
+                yield ln.rstrip("\n")
+    if sustituidos:
+        WARNINGS.append(f"{sustituidos} carácter(es) no válidos en {enc} "
+                        f"sustituidos por “\ufffd” en {Path(path).name}")
+
 # ════════════════════════════════════════════════════════════════════════
 #  PARSER – LTspice
 # ════════════════════════════════════════════════════════════════════════
@@ -88,13 +170,18 @@ _RE_RADPAR  = re.compile(r"^RAD", re.I)
 def parse_ltspice(p: Path):
     vals, pkgs, v_tols = {}, {}, {}
     grp_tol, grp_temp, grp_age, grp_rad = {}, {}, {}, {}
+    pendientes = []               # (ref, token) R/C/L, a resolver tras los .param
 
-    txt = p.read_text(encoding="latin-1", errors="ignore").splitlines()
-
-    # 1) .param
-    for ln in txt:
+    # 1) .param  (y se apartan las líneas R/C/L)
+    for ln in leer_lineas(p):
         ln = ln.split(";", 1)[0].strip()
-        if not ln.lower().startswith(".param"): continue
+        if not ln.lower().startswith(".param"):
+            if not ln or ln[0] in ".*+": continue
+            toks = ln.split()
+            ref = toks[0].upper()
+            if ref[0] not in "RCL": continue
+            pendientes.append((ref, toks[3] if len(toks) > 3 else toks[2]))
+            continue
         for tok in ln[6:].split():
             if "=" not in tok: continue
             k, v = tok.split("=", 1)
@@ -118,14 +205,7 @@ def parse_ltspice(p: Path):
                 v_tols[key] = (0.0, 0.0, 0.0, 0.0)
 
     # 2) R/C/L con mc()
-    for ln in txt:
-        ln = ln.split(";", 1)[0].strip()
-        if not ln or ln[0] in ".*+": continue
-        toks = ln.split()
-        ref = toks[0].upper()
-        if ref[0] not in "RCL": continue
-        token = toks[3] if len(toks) > 3 else toks[2]
-
+    for ref, token in pendientes:
         m = _RE_MCPAR.search(token)
         if m:
             first, namep = m.group(1).strip(), m.group(2).strip().upper()
@@ -152,13 +232,17 @@ _RE_GAUSS = re.compile(r"\{([^}]*gauss\([^}]+\)[^}]*)\}", re.I)
 def parse_simetrix(p: Path):
     vals, pkgs, v_tols = {}, {}, {}
     grp_tol, grp_temp, grp_age, grp_rad = {}, {}, {}, {}
+    pendientes = []               # (ref, token) R/C/L, a resolver tras los .param
 
-    txt = p.read_text(encoding="utf-8", errors="ignore").splitlines()
-
-    # .param
-    for ln in txt:
+    # .param  (y se apartan las líneas R/C/L)
+    for ln in leer_lineas(p):
         ln = ln.split(";", 1)[0].strip()
-        if not ln.lower().startswith(".param"): continue
+        if not ln.lower().startswith(".param"):
+            if not ln or ln[0] in ".*": continue
+            t = ln.split()
+            if t[0][0] not in "RCL": continue
+            pendientes.append((t[0].upper(), t[3] if len(t) > 3 else t[2]))
+            continue
         for tok in ln.split()[1:]:
             if "=" not in tok: continue
             k, v = tok.split("=", 1)
@@ -182,14 +266,7 @@ def parse_simetrix(p: Path):
                 v_tols[key] = (0.0, 0.0, 0.0, 0.0)
 
     # R/C/L con gauss()
-    for ln in txt:
-        ln = ln.split(";", 1)[0].strip()
-        if not ln or ln[0] in ".*": continue
-        t = ln.split()
-        if t[0][0] not in "RCL": continue
-        ref   = t[0].upper()
-        token = t[3] if len(t) > 3 else t[2]
-
+    for ref, token in pendientes:
         m = _RE_GAUSS.search(token)
         if m:
             content = m.group(1)
@@ -224,17 +301,17 @@ def _tokenise_plain(line: str) -> list[str]:
     return [t for t in re.split(r"\t+| {2,}", line.strip()) if t]
 
 def parse_bom(p: Path):
-    raw = p.read_text(encoding="utf-8", errors="ignore").splitlines()
+    lineas = leer_lineas(p)
 
-    hdr_idx = next((i for i,l in enumerate(raw)
-                    if "ref" in l.lower() and ("value" in l.lower()
-                        or "val" in l.lower() or "part" in l.lower()
-                        or "component" in l.lower())), None)
-    if hdr_idx is None:
+    header_line = next((l for l in lineas
+                        if "ref" in l.lower() and ("value" in l.lower()
+                            or "val" in l.lower() or "part" in l.lower()
+                            or "component" in l.lower())), None)
+    if header_line is None:
         raise ValueError("BoM: cabecera Reference / Value no encontrada")
 
-    header_line = raw[hdr_idx]
-    sample      = "\n".join(raw[hdr_idx:hdr_idx+20])
+    cabeza = [header_line, *islice(lineas, 19)]
+    sample = "\n".join(cabeza)
 
     csv_ok = True
     try:
@@ -245,7 +322,7 @@ def parse_bom(p: Path):
     vals, pkgs, v_tols = {}, {}, {}
 
     if csv_ok and dialect.delimiter not in " \t":
-        rdr = csv.DictReader(raw[hdr_idx:], dialect=dialect, skipinitialspace=True)
+        rdr = csv.DictReader(chain(cabeza, lineas), dialect=dialect, skipinitialspace=True)
         cref = _col(rdr.fieldnames, "ref", "design")
         cval = _col(rdr.fieldnames, "value", "val", "part", "component")
         ctol = _col(rdr.fieldnames, "toler", "tol")
@@ -280,7 +357,7 @@ def parse_bom(p: Path):
         i_tc  = next((i for i,h in enumerate(headers) if "temp" in h or "tc" in h), None)
         i_pkg = next((i for i,h in enumerate(headers) if "package" in h or "footprint" in h or "type" in h), None)
 
-        for ln in raw[hdr_idx+1:]:
+        for ln in chain(cabeza[1:], lineas):
             if not re.search(r"\d", ln): continue
             toks = _tokenise_plain(ln)
             if len(toks) <= max(i_ref, i_val): continue
@@ -350,44 +427,81 @@ def _resumen_ok(txt: str) -> str:
                 + "\n  – ".join(WARNINGS))
     return txt
 
-def procesar_net(path, hs=""):
-    WARNINGS.clear()
-    p = Path(path)
-    if "simetrix" in p.suffix.lower() or p.suffix.lower() == ".sxsch":
-        vals, pkgs, tols = parse_simetrix(p)
-    else:
-        vals, pkgs, tols = parse_ltspice(p)
-    write_xlsx(vals, pkgs, tols, hs)
-    return _resumen_ok(f"✔ {len(vals)} comp ({p.name})")
+_EXT_NET = {".net", ".asc", ".sxsch"}
 
-def procesar_bom(path, hs=""):
-    WARNINGS.clear()
-    vals, pkgs, tols = parse_bom(Path(path))
-    write_xlsx(vals, pkgs, tols, hs)
-    return _resumen_ok(f"✔ {len(vals)} filas BoM ({Path(path).name})")
+def _parse_net(p: Path):
+    if "simetrix" in p.suffix.lower() or p.suffix.lower() == ".sxsch":
+        return parse_simetrix(p)
+    return parse_ltspice(p)
 
-def procesar_generico(path, hs=""):
-    WARNINGS.clear()
+def _parse_generico(p: Path):
     vals, pkgs, tols = {}, {}, {}
-    with Path(path).open() as f:
-        for ref, val, *rest in csv.reader(f):
-            r = ref.strip().upper()
+    for ref, val, *rest in csv.reader(leer_lineas(p)):
+        r = ref.strip().upper()
+        try:
+            v = float(val)
+        except ValueError:
+            WARNINGS.append(f"Valor no numérico en CSV: “{val}” (ref {r})")
+            v = 0.0
+        tol = 0.0
+        if rest and rest[0].strip():
             try:
-                v = float(val)
+                tol = float(rest[0]) / 100
             except ValueError:
-                WARNINGS.append(f"Valor no numérico en CSV: “{val}” (ref {r})")
-                v = 0.0
-            tol = 0.0
-            if rest and rest[0].strip():
-                try:
-                    tol = float(rest[0]) / 100
-                except ValueError:
-                    WARNINGS.append(f"Tolerancia no numérica en CSV: “{rest[0]}” (ref {r})")
-            vals[r] = v
-            pkgs[r] = guess_pkg(r, tol)
-            tols[r] = (tol, 0.0, 0.0, 0.0)
-    write_xlsx(vals, pkgs, tols, hs)
-    return _resumen_ok(f"✔ CSV {Path(path).name}")
+                WARNINGS.append(f"Tolerancia no numérica en CSV: “{rest[0]}” (ref {r})")
+        vals[r] = v
+        pkgs[r] = guess_pkg(r, tol)
+        tols[r] = (tol, 0.0, 0.0, 0.0)
+    return vals, pkgs, tols
+
+_PARSERS = {"net": _parse_net, "bom": parse_bom, "csv": _parse_generico}
+
+def _tipo_por_extension(p: Path) -> str:
+    ext = p.suffix.lower()
+    if ext in _EXT_NET:
+        return "net"
+    return "bom" if ext == ".bom" else "csv"
+
+def traducir(path, hs="", dst=DEST_XLSX, tipo: str | None = None) -> dict:
+    """
+    Genera el Excel y devuelve un resumen serializable (JSON).
+    Sin `tipo` el parser se elige por la extensión (única tabla de
+    despacho: _EXT_NET / .bom / resto CSV); con `tipo` ("net", "bom",
+    "csv") se fuerza.
+    """
+    WARNINGS.clear()
+    p = Path(path)
+    tipo = tipo or _tipo_por_extension(p)
+    vals, pkgs, tols = _PARSERS[tipo](p)
+    write_xlsx(vals, pkgs, tols, hs, dst)
+    return {
+        "archivo":      str(p),
+        "tipo":         tipo,
+        "componentes":  len(vals),
+        "xlsx":         str(Path(dst).resolve()),
+        "advertencias": list(WARNINGS),
+    }
+
+_RESUMEN = {
+    "net": "✔ {n} comp ({nombre})",
+    "bom": "✔ {n} filas BoM ({nombre})",
+    "csv": "✔ CSV {nombre}",
+}
+
+def procesar(path, hs="", dst=DEST_XLSX, tipo: str | None = None):
+    """Como traducir(), pero devuelve el resumen en texto (GUI / CLI)."""
+    res = traducir(path, hs, dst, tipo)
+    return _resumen_ok(_RESUMEN[res["tipo"]].format(n=res["componentes"],
+                                                    nombre=Path(path).name))
+
+def procesar_net(path, hs="", dst=DEST_XLSX):
+    return procesar(path, hs, dst, tipo="net")
+
+def procesar_bom(path, hs="", dst=DEST_XLSX):
+    return procesar(path, hs, dst, tipo="bom")
+
+def procesar_generico(path, hs="", dst=DEST_XLSX):
+    return procesar(path, hs, dst, tipo="csv")
 
 # ═════════════════ CLI directo ──────────────────────────────────────────
 if __name__ == "__main__":
@@ -398,11 +512,6 @@ if __name__ == "__main__":
     if not f.exists():
         sys.exit("Archivo no encontrado")
     try:
-        if f.suffix.lower() in {".net", ".asc", ".sxsch"}:
-            print(procesar_net(f, hs))
-        elif f.suffix.lower() == ".bom":
-            print(procesar_bom(f, hs))
-        else:
-            print(procesar_generico(f, hs))
+        print(procesar(f, hs))
     except Exception as e:
         sys.exit(f"Error: {e}")